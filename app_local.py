@@ -1,16 +1,267 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import json
-import numpy as np
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 from data_service import DataService
 from mistral_service import MistralService
 from visualization import Visualization
 from utils import format_number, get_metric_description
 
+# Point-per-row charts (scatter, bubble) are downsampled above this many rows;
+# they pass use_gl=None so visualization.WEBGL_THRESHOLD alone picks SVG or WebGL
+MAX_PLOT_POINTS = 200
+
+@st.cache_resource
+def _data_service():
+    """Shared DataService so its HTTP session is reused across reruns"""
+    return DataService()
+
+@st.cache_resource
+def _mistral_service():
+    """Shared MistralService, configured once per process"""
+    return MistralService()
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def _cached_insights(payload_key, _payload_json):
+    """Generate AI insights once per distinct analysis payload per day"""
+    insights = _mistral_service().generate_country_insights(json.loads(_payload_json))
+    if not insights:
+        # Raising keeps failed generations out of the cache so a retry can succeed
+        raise RuntimeError("Mistral returned no insights")
+    return insights
+
+@st.cache_data(show_spinner=False)
+def _cached_chart(chart_method, _df, df_key, *args):
+    """Build a palette-agnostic chart once per distinct data and chart arguments.
+
+    The frame itself is not hashed; ``df_key`` is its precomputed fingerprint.
+    """
+    return getattr(Visualization(), chart_method)(_df, *args)
+
+def _render_chart(visualization, chart_method, df, df_key, *args):
+    """Get a cached chart and color it with the session's palette.
+
+    Chart builders only guard against missing data; any other failure is turned
+    into an error chart here, and is not cached, so the next rerun retries it.
+    """
+    try:
+        fig = _cached_chart(chart_method, df, df_key, *args)
+    except Exception as e:
+        chart_name = chart_method[len("create_"):].replace("_", " ")
+        fig = visualization.create_error_chart(f"Error creating {chart_name}: {str(e)}")
+    return visualization.apply_palette(fig)
+
+@st.cache_data(show_spinner=False)
+def _cached_csv(_df, df_key):
+    """Serialize the comparison frame to CSV once per distinct frame"""
+    return _df.to_csv(index=False).encode()
+
+@st.cache_data(show_spinner=False)
+def _cached_json(_df, df_key):
+    """Serialize the comparison frame to JSON records once per distinct frame"""
+    return _df.to_json(orient='records', indent=2).encode()
+
+def _frame_key(df):
+    """Fingerprint a DataFrame's contents for use as a cache key"""
+    digest = hashlib.blake2b(digest_size=16)
+    # Row hashes ignore column labels, so mix those in as well
+    digest.update("\x1f".join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+def _summarize_metric(values):
+    """Summarize one metric column: extremes, total and the entities holding them"""
+    values = pd.to_numeric(values, errors='coerce').dropna()
+    if values.empty:
+        return pd.Series({'max': None, 'min': None, 'sum': None, 'argmax': None, 'argmin': None}, dtype=object)
+    return pd.Series({
+        'max': values.max(),
+        'min': values.min(),
+        'sum': values.sum(),
+        'argmax': values.idxmax(),
+        'argmin': values.idxmin()
+    }, dtype=object)
+
+@st.fragment
+def _render_standard_view(visualization, df, df_key, stats, selected_metrics, analysis_level):
+    """Standard charts view; its widgets rerun only this fragment"""
+    st.markdown("## 📊 Standard Visualization Options")
+    
+    # Chart type selection with descriptions
+    chart_options = {
+        "Bar Chart": "Compare values across entities with horizontal bars",
+        "Line Chart": "Show trends and relationships between metrics",
+        "Scatter Plot": "Explore correlations between different metrics",
+        "Radar Chart": "Multi-dimensional comparison across all metrics"
+    }
+    
+    selected_chart = st.selectbox(
+        "Choose Visualization Type:",
+        list(chart_options.keys()),
+        help="Select the type of chart that best fits your analysis needs"
+    )
+    
+    st.info(f"💡 {chart_options[selected_chart]}")
+
+    if len(selected_metrics) >= 1:
+        metric = selected_metrics[0]
+        
+        if selected_chart == "Bar Chart":
+            fig = _render_chart(visualization, "create_enhanced_bar_chart", df, df_key, metric)
+        elif selected_chart == "Line Chart":
+            fig = _render_chart(visualization, "create_line_chart", df, df_key, metric)
+        elif selected_chart == "Scatter Plot":
+            fig = _render_chart(visualization, "create_scatter_plot", df, df_key, metric, None, MAX_PLOT_POINTS)
+        else:  # Radar Chart
+            fig = _render_chart(visualization, "create_radar_chart", df, df_key, selected_metrics[:5])  # Limit to 5 metrics for readability
+            
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # Built-in AI Analysis
+        with st.expander("🤖 AI Analysis for this Chart", expanded=False):
+            metric_stats = stats[metric]
+            if pd.notna(metric_stats['argmax']):
+                best_entity = metric_stats['argmax']
+                best_value = metric_stats['max']
+                worst_value = metric_stats['min']
+                
+                st.markdown(f"""
+                **📊 Chart Analysis:**
+                
+                • **Top Performer:** {best_entity} leads with {format_number(best_value)}
+                • **Performance Gap:** {format_number(best_value - worst_value)} difference between highest and lowest
+                • **{metric} Insight:** This metric shows significant variation across {analysis_level.lower()}
+                • **Recommendation:** Focus on understanding what makes {best_entity} successful in this area
+                """)
+
+@st.fragment
+def _render_advanced_view(visualization, df, df_key, stats, selected_metrics, analysis_level):
+    """Advanced charts view; its widgets rerun only this fragment"""
+    st.markdown("## 🎯 Advanced Visualization Options")
+    
+    # Advanced chart selection
+    adv_chart_col1, adv_chart_col2 = st.columns(2)
+    
+    with adv_chart_col1:
+        st.markdown("### 🍩 Donut Chart")
+        if len(selected_metrics) >= 1:
+            donut_metric = st.selectbox("Select metric for donut chart:", selected_metrics, key="donut")
+            fig_donut = _render_chart(visualization, "create_donut_chart", df, df_key, donut_metric)
+            st.plotly_chart(fig_donut, use_container_width=True)
+            
+            # AI Analysis for donut chart
+            with st.expander("🤖 AI Analysis for Donut Chart", expanded=False):
+                metric_stats = stats[donut_metric]
+                if pd.notna(metric_stats['argmax']):
+                    total_value = metric_stats['sum']
+                    largest_share = metric_stats['argmax']
+                    largest_percentage = (metric_stats['max'] / total_value) * 100
+                    
+                    insights_text = f"""
+                    **🍩 Distribution Analysis:**
+                    
+                    • **Dominant Player:** {largest_share} accounts for {largest_percentage:.1f}% of total {donut_metric}
+                    • **Market Share:** Shows relative contribution of each {analysis_level.lower()} to the overall metric
+                    • **Concentration Level:** {'High concentration' if largest_percentage > 40 else 'Balanced distribution'} in this indicator
+                    • **Strategic Insight:** Understanding proportional contributions helps identify key players and market dynamics
+                    """
+                    st.markdown(insights_text)
+    
+    with adv_chart_col2:
+        st.markdown("### 📊 Box Plot (Statistical)")
+        if len(selected_metrics) >= 1:
+            box_metric = st.selectbox("Select metric for box plot:", selected_metrics, key="box")
+            fig_box = _render_chart(visualization, "create_box_plot", df, df_key, box_metric)
+            st.plotly_chart(fig_box, use_container_width=True)
+
+    if len(selected_metrics) >= 3:
+        st.markdown("### 🫧 Bubble Chart (3 Metrics)")
+        bubble_col1, bubble_col2, bubble_col3 = st.columns(3)
+        with bubble_col1:
+            x_metric = st.selectbox("X-axis metric:", selected_metrics, key="bubble_x")
+        with bubble_col2:
+            y_metric = st.selectbox("Y-axis metric:", selected_metrics, key="bubble_y", index=1)
+        with bubble_col3:
+            size_metric = st.selectbox("Bubble size metric:", selected_metrics, key="bubble_size", index=2)
+        
+        fig_bubble = _render_chart(visualization, "create_bubble_chart", df, df_key, x_metric, y_metric, size_metric, None, MAX_PLOT_POINTS)
+        st.plotly_chart(fig_bubble, use_container_width=True)
+
+    if len(selected_metrics) >= 1:
+        st.markdown("### 🌳 Treemap Visualization")
+        treemap_metric = st.selectbox("Select metric for treemap:", selected_metrics, key="treemap")
+        fig_treemap = _render_chart(visualization, "create_treemap", df, df_key, treemap_metric)
+        st.plotly_chart(fig_treemap, use_container_width=True)
+
+@st.fragment
+def _render_ai_view(mistral_service, df, df_key, all_data, entities, selected_metrics, analysis_level, data_type):
+    """AI insights and export view; its widgets rerun only this fragment"""
+    st.markdown("## 🤖 AI Insights & Data Export")
+    
+    # AI Service Status, resolved once per session; "Reconnect AI" re-checks it
+    if '_mistral_ok' not in st.session_state:
+        st.session_state._mistral_ok = mistral_service.is_available()
+    
+    if st.session_state._mistral_ok:
+        st.success("🤖 Mistral AI Service Connected - Enhanced insights available!")
+        
+        if st.button("🧠 Generate Comprehensive AI Analysis", key="ai_comprehensive"):
+            with st.spinner("🤖 Generating comprehensive AI insights..."):
+                analysis_data = {
+                    "entities": entities,
+                    "metrics": selected_metrics,
+                    "data": all_data,
+                    "analysis_level": analysis_level
+                }
+                
+                payload_json = json.dumps(analysis_data, sort_keys=True, default=str)
+                payload_key = hashlib.sha1(payload_json.encode()).hexdigest()
+                try:
+                    insights = _cached_insights(payload_key, payload_json)
+                except RuntimeError:
+                    insights = None
+                if insights:
+                    st.markdown("### 🧠 AI-Generated Insights")
+                    st.markdown(insights)
+                else:
+                    st.warning("Unable to generate AI insights at this time.")
+    else:
+        st.info("🔑 Add your Mistral API key to the .env file for enhanced AI insights!")
+        st.markdown("**Current Analysis:** Basic statistical insights are provided under each chart.")
+        
+        if st.button("🔄 Reconnect AI", key="ai_reconnect"):
+            # Rebuild the shared service so it re-reads its configuration
+            MistralService.reload_api_key()
+            _mistral_service.clear()
+            del st.session_state._mistral_ok
+            st.rerun()
+    
+    # Data Export
+    st.markdown("### 📊 Export Data")
+    if not df.empty:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            csv_data = _cached_csv(df, df_key)
+            st.download_button(
+                label="📁 Download CSV",
+                data=csv_data,
+                file_name=f"{data_type}_comparison_{pd.Timestamp.now().strftime('%Y%m%d_%H%M')}.csv",
+                mime="text/csv"
+            )
+        
+        with col2:
+            json_data = _cached_json(df, df_key)
+            st.download_button(
+                label="📋 Download JSON",
+                data=json_data,
+                file_name=f"{data_type}_comparison_{pd.Timestamp.now().strftime('%Y%m%d_%H%M')}.json",
+                mime="application/json"
+            )
+
 def main():
     st.set_page_config(
         page_title="Country & State Comparison Tool",
@@ -46,9 +297,13 @@ def main():
     """, unsafe_allow_html=True)
 
     # Initialize services
-    data_service = DataService()
-    mistral_service = MistralService()
-    visualization = Visualization()
+    data_service = _data_service()
+    mistral_service = _mistral_service()
+    # Visualization holds the user's palette, so it is kept per session
+    # rather than shared across sessions like the stateless services
+    if 'visualization' not in st.session_state:
+        st.session_state.visualization = Visualization()
+    visualization = st.session_state.visualization
 
     # Main header
     st.markdown('<h1 class="main-header">🌍 Advanced Country & State Comparison Tool</h1>', unsafe_allow_html=True)
@@ -169,8 +424,7 @@ def main():
         
         # Quick select options at the top
         st.markdown("**🚀 Quick Select Presets:**")
-        col1, col2 = st.columns(2)
-        col3, col4 = st.columns(2)
+        col1, col2, col3, col4 = st.columns(4)
         
         with col1:
             if st.button("💰 Economic Focus", key="economic_preset"):
@@ -179,7 +433,6 @@ def main():
                     "GDP growth (annual %)",
                     "Unemployment, total (% of total labor force)"
                 ]
-                st.rerun()
         
         with col2:
             if st.button("👥 Social Focus", key="social_preset"):
@@ -188,7 +441,6 @@ def main():
                     "Population growth (annual %)",
                     "Urban population (% of total population)"
                 ]
-                st.rerun()
         
         with col3:
             if st.button("🎓 Development", key="development_preset"):
@@ -197,7 +449,6 @@ def main():
                     "Health expenditure, total (% of GDP)",
                     "Internet users (per 100 people)"
                 ]
-                st.rerun()
         
         with col4:
             if st.button("🌍 Comprehensive", key="comprehensive_preset"):
@@ -207,7 +458,6 @@ def main():
                     "School enrollment, primary (% net)",
                     "Urban population (% of total population)"
                 ]
-                st.rerun()
         
         st.markdown("---")
         st.markdown("**📋 Manual Selection:**")
@@ -216,16 +466,20 @@ def main():
         if 'selected_metrics' not in st.session_state:
             st.session_state.selected_metrics = []
         
-        for category, metrics in metrics_categories.items():
-            with st.expander(category, expanded=False):
-                for metric in metrics:
-                    checked = metric in st.session_state.selected_metrics
-                    if st.checkbox(metric, value=checked, key=f"metric_{hash(metric)}"):
-                        if metric not in st.session_state.selected_metrics:
-                            st.session_state.selected_metrics.append(metric)
-                    else:
-                        if metric in st.session_state.selected_metrics:
-                            st.session_state.selected_metrics.remove(metric)
+        # One multiselect bound to session state replaces a checkbox per metric,
+        # so a selection change is a single widget update
+        metric_icons = {
+            metric: category.split()[0]
+            for category, metrics in metrics_categories.items()
+            for metric in metrics
+        }
+        st.multiselect(
+            "Select Metrics:",
+            list(metric_icons),
+            format_func=lambda metric: f"{metric_icons[metric]} {metric}",
+            key="selected_metrics",
+            help="Metrics are prefixed with their category icon"
+        )
         
         selected_metrics = st.session_state.selected_metrics
 
@@ -245,195 +499,63 @@ def main():
         st.warning("Please select at least one metric to analyze.")
         return
 
+    # Canonical metric set: every entity fetch for this selection shares one cache key
+    metrics_key = tuple(sorted(set(selected_metrics)))
+
     # Fetch data
     with st.spinner(f"📡 Fetching real-time data from World Bank API for {len(entities)} {data_type}..."):
         all_data = {}
         
-        for entity in entities:
-            if analysis_level == "Country Level":
-                entity_data = data_service.get_country_data(entity, selected_metrics)
-            else:
-                entity_data = data_service.get_state_data(selected_country_for_states, entity, selected_metrics)
+        if analysis_level == "Country Level":
+            # One request per indicator covers every selected country
+            countries_data = data_service.get_countries_data(entities, list(metrics_key))
+            for entity in entities:
+                if countries_data.get(entity):
+                    all_data[entity] = countries_data[entity]
+        else:
+            def fetch_state(state):
+                return data_service.get_state_data(selected_country_for_states, state, list(metrics_key))
             
-            if entity_data:
-                all_data[entity] = entity_data
+            # Fetches are network-bound, so overlap them on worker threads; the
+            # script run context is attached so cached calls and warnings still work
+            with ThreadPoolExecutor(
+                max_workers=min(16, len(entities)),
+                initializer=add_script_run_ctx,
+                initargs=(None, get_script_run_ctx())
+            ) as executor:
+                # map() keeps results in selection order for the charts below
+                for entity, entity_data in zip(entities, executor.map(fetch_state, entities)):
+                    if entity_data:
+                        all_data[entity] = entity_data
 
     if not all_data:
         st.error(f"❌ Unable to fetch data for the selected {data_type}. Please try again or select different options.")
         return
 
     # Create DataFrame for visualization
-    df_list = []
-    for entity, data in all_data.items():
-        row = {"Country" if analysis_level == "Country Level" else "State": entity}
-        row.update(data)
-        df_list.append(row)
-
-    df = pd.DataFrame(df_list)
     entity_col = "Country" if analysis_level == "Country Level" else "State"
+    df = pd.DataFrame.from_dict(all_data, orient='index').rename_axis(entity_col).reset_index()
+    
+    # Hash the frame once per rerun rather than at every cached call site
+    df_key = _frame_key(df)
+    
+    # Per-metric summary shared by the chart analysis panels
+    stats = df.set_index(entity_col)[[m for m in selected_metrics if m in df.columns]].apply(_summarize_metric)
 
     # Success message
     st.success(f"✅ Successfully loaded data for {len(df)} {data_type} with {len(selected_metrics)} metrics!")
 
-    # Enhanced Tabs with more visualization options
-    tab1, tab2, tab3 = st.tabs(["📊 Standard Charts", "🎯 Advanced Visualizations", "🤖 AI Insights & Export"])
-
-    with tab1:
-        st.markdown("## 📊 Standard Visualization Options")
-        
-        # Chart type selection with descriptions
-        chart_options = {
-            "Bar Chart": "Compare values across entities with horizontal bars",
-            "Line Chart": "Show trends and relationships between metrics",
-            "Scatter Plot": "Explore correlations between different metrics",
-            "Radar Chart": "Multi-dimensional comparison across all metrics"
-        }
-        
-        selected_chart = st.selectbox(
-            "Choose Visualization Type:",
-            list(chart_options.keys()),
-            help="Select the type of chart that best fits your analysis needs"
-        )
-        
-        st.info(f"💡 {chart_options[selected_chart]}")
-
-        if len(selected_metrics) >= 1:
-            metric = selected_metrics[0]
-            
-            if selected_chart == "Bar Chart":
-                fig = visualization.create_enhanced_bar_chart(df, metric)
-            elif selected_chart == "Line Chart":
-                fig = visualization.create_line_chart(df, metric)
-            elif selected_chart == "Scatter Plot":
-                fig = visualization.create_scatter_plot(df, metric)
-            else:  # Radar Chart
-                fig = visualization.create_radar_chart(df, selected_metrics[:5])  # Limit to 5 metrics for readability
-                
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Built-in AI Analysis
-            with st.expander("🤖 AI Analysis for this Chart", expanded=False):
-                valid_data = {entity: all_data[entity].get(metric) for entity in entities if entity in all_data and all_data[entity].get(metric) is not None}
-                if valid_data:
-                    best_entity = max(valid_data, key=valid_data.get)
-                    worst_entity = min(valid_data, key=valid_data.get)
-                    best_value = valid_data[best_entity]
-                    worst_value = valid_data[worst_entity]
-                    
-                    st.markdown(f"""
-                    **📊 Chart Analysis:**
-                    
-                    • **Top Performer:** {best_entity} leads with {format_number(best_value)}
-                    • **Performance Gap:** {format_number(best_value - worst_value)} difference between highest and lowest
-                    • **{metric} Insight:** This metric shows significant variation across {analysis_level.lower()}
-                    • **Recommendation:** Focus on understanding what makes {best_entity} successful in this area
-                    """)
-
-    with tab2:
-        st.markdown("## 🎯 Advanced Visualization Options")
-        
-        # Advanced chart selection
-        adv_chart_col1, adv_chart_col2 = st.columns(2)
-        
-        with adv_chart_col1:
-            st.markdown("### 🍩 Donut Chart")
-            if len(selected_metrics) >= 1:
-                donut_metric = st.selectbox("Select metric for donut chart:", selected_metrics, key="donut")
-                fig_donut = visualization.create_donut_chart(df, donut_metric)
-                st.plotly_chart(fig_donut, use_container_width=True)
-                
-                # AI Analysis for donut chart
-                with st.expander("🤖 AI Analysis for Donut Chart", expanded=False):
-                    valid_data = {entity: all_data[entity].get(donut_metric) for entity in entities if entity in all_data and all_data[entity].get(donut_metric) is not None}
-                    if valid_data:
-                        total_value = sum(valid_data.values())
-                        largest_share = max(valid_data, key=valid_data.get)
-                        largest_percentage = (valid_data[largest_share] / total_value) * 100
-                        
-                        insights_text = f"""
-                        **🍩 Distribution Analysis:**
-                        
-                        • **Dominant Player:** {largest_share} accounts for {largest_percentage:.1f}% of total {donut_metric}
-                        • **Market Share:** Shows relative contribution of each {analysis_level.lower()} to the overall metric
-                        • **Concentration Level:** {'High concentration' if largest_percentage > 40 else 'Balanced distribution'} in this indicator
-                        • **Strategic Insight:** Understanding proportional contributions helps identify key players and market dynamics
-                        """
-                        st.markdown(insights_text)
-        
-        with adv_chart_col2:
-            st.markdown("### 📊 Box Plot (Statistical)")
-            if len(selected_metrics) >= 1:
-                box_metric = st.selectbox("Select metric for box plot:", selected_metrics, key="box")
-                fig_box = visualization.create_box_plot(df, box_metric)
-                st.plotly_chart(fig_box, use_container_width=True)
-
-        if len(selected_metrics) >= 3:
-            st.markdown("### 🫧 Bubble Chart (3 Metrics)")
-            bubble_col1, bubble_col2, bubble_col3 = st.columns(3)
-            with bubble_col1:
-                x_metric = st.selectbox("X-axis metric:", selected_metrics, key="bubble_x")
-            with bubble_col2:
-                y_metric = st.selectbox("Y-axis metric:", selected_metrics, key="bubble_y", index=1)
-            with bubble_col3:
-                size_metric = st.selectbox("Bubble size metric:", selected_metrics, key="bubble_size", index=2)
-            
-            fig_bubble = visualization.create_bubble_chart(df, x_metric, y_metric, size_metric)
-            st.plotly_chart(fig_bubble, use_container_width=True)
-
-        if len(selected_metrics) >= 1:
-            st.markdown("### 🌳 Treemap Visualization")
-            treemap_metric = st.selectbox("Select metric for treemap:", selected_metrics, key="treemap")
-            fig_treemap = visualization.create_treemap(df, treemap_metric)
-            st.plotly_chart(fig_treemap, use_container_width=True)
+    # Tab-style view switcher: unlike st.tabs, only the selected view's body runs,
+    # so figures for views the user is not looking at are never built
+    views = ["📊 Standard Charts", "🎯 Advanced Visualizations", "🤖 AI Insights & Export"]
+    selected_view = st.radio("View", views, horizontal=True, label_visibility="collapsed", key="active_view")
 
-    with tab3:
-        st.markdown("## 🤖 AI Insights & Data Export")
-        
-        # AI Service Status
-        if mistral_service.is_available():
-            st.success("🤖 Mistral AI Service Connected - Enhanced insights available!")
-            
-            if st.button("🧠 Generate Comprehensive AI Analysis", key="ai_comprehensive"):
-                with st.spinner("🤖 Generating comprehensive AI insights..."):
-                    analysis_data = {
-                        "entities": entities,
-                        "metrics": selected_metrics,
-                        "data": all_data,
-                        "analysis_level": analysis_level
-                    }
-                    
-                    insights = mistral_service.generate_country_insights(analysis_data)
-                    if insights:
-                        st.markdown("### 🧠 AI-Generated Insights")
-                        st.markdown(insights)
-                    else:
-                        st.warning("Unable to generate AI insights at this time.")
-        else:
-            st.info("🔑 Add your Mistral API key to the .env file for enhanced AI insights!")
-            st.markdown("**Current Analysis:** Basic statistical insights are provided under each chart.")
-        
-        # Data Export
-        st.markdown("### 📊 Export Data")
-        if not df.empty:
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                csv_data = df.to_csv(index=False)
-                st.download_button(
-                    label="📁 Download CSV",
-                    data=csv_data,
-                    file_name=f"{data_type}_comparison_{pd.Timestamp.now().strftime('%Y%m%d_%H%M')}.csv",
-                    mime="text/csv"
-                )
-            
-            with col2:
-                json_data = df.to_json(orient='records', indent=2)
-                st.download_button(
-                    label="📋 Download JSON",
-                    data=json_data,
-                    file_name=f"{data_type}_comparison_{pd.Timestamp.now().strftime('%Y%m%d_%H%M')}.json",
-                    mime="application/json"
-                )
+    if selected_view == views[0]:
+        _render_standard_view(visualization, df, df_key, stats, selected_metrics, analysis_level)
+    elif selected_view == views[1]:
+        _render_advanced_view(visualization, df, df_key, stats, selected_metrics, analysis_level)
+    else:
+        _render_ai_view(mistral_service, df, df_key, all_data, entities, selected_metrics, analysis_level, data_type)
 
 if __name__ == "__main__":
     main()
@@ -1,8 +1,140 @@
-import requests
+import requests_cache
+import orjson
 import streamlit as st
-from typing import Dict, List, Optional
-import time
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Final, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+# Concurrent indicator requests per country
+MAX_FETCH_WORKERS = 10
+
+# Keep-alive connections held for the World Bank host; sized so concurrent
+# state fetches, each running MAX_FETCH_WORKERS requests, share pooled sockets
+HTTP_POOL_SIZE = 50
+
+# Map display names to World Bank indicator codes
+INDICATOR_MAPPING: Final[Dict[str, str]] = {
+    "GDP per capita (current US$)": "NY.GDP.PCAP.CD",
+    "GDP growth (annual %)": "NY.GDP.MKTP.KD.ZG",
+    "Population, total": "SP.POP.TOTL",
+    "Population growth (annual %)": "SP.POP.GROW",
+    "Life expectancy at birth, total (years)": "SP.DYN.LE00.IN",
+    "Inflation, consumer prices (annual %)": "FP.CPI.TOTL.ZG",
+    "Unemployment, total (% of total labor force)": "SL.UEM.TOTL.ZS",
+    "School enrollment, primary (% net)": "SE.PRM.NENR",
+    "Health expenditure, total (% of GDP)": "SH.XPD.CHEX.GD.ZS",
+    "Urban population (% of total population)": "SP.URB.TOTL.IN.ZS",
+    "CO2 emissions (metric tons per capita)": "EN.ATM.CO2E.PC",
+    "Internet users (per 100 people)": "IT.NET.USER.ZS",
+    "Trade (% of GDP)": "NE.TRD.GNFS.ZS",
+    "Government expenditure on education, total (% of GDP)": "SE.XPD.TOTL.GD.ZS",
+    "Military expenditure (% of GDP)": "MS.MIL.XPND.GD.ZS",
+    "Literacy rate, adult total (% of people ages 15 and above)": "SE.ADT.LITR.ZS",
+    "Mortality rate, infant (per 1,000 live births)": "SP.DYN.IMRT.IN",
+    "Hospital beds (per 1,000 people)": "SH.MED.BEDS.ZS",
+    "Research and development expenditure (% of GDP)": "GB.XPD.RSDV.GD.ZS",
+    "Scientific and technical journal articles": "IP.JRN.ARTC.SC",
+    "Age dependency ratio (% of working-age population)": "SP.POP.DPND"
+}
+
+def _indicator_category(indicator: str) -> Optional[str]:
+    """Classify an indicator name for the regional state multipliers"""
+    if "GDP" in indicator:
+        return "economic"
+    if "School" in indicator or "education" in indicator:
+        return "education"
+    if "Life expectancy" in indicator or "Health" in indicator:
+        return "health"
+    return None
+
+# Multiplier category per known indicator, classified once at import
+INDICATOR_CATEGORY: Final[Dict[str, Optional[str]]] = {
+    indicator: _indicator_category(indicator) for indicator in INDICATOR_MAPPING
+}
+
+# Regional multipliers per category: (leading states, default for the rest)
+US_MULTIPLIERS: Final[Dict[str, Tuple[Dict[str, float], float]]] = {
+    "economic": ({"New York": 1.35, "California": 1.25, "Massachusetts": 1.30}, 0.95),
+    "education": ({"Massachusetts": 1.25, "Connecticut": 1.20, "New Jersey": 1.15}, 0.95),
+    "health": ({"Hawaii": 1.10, "Massachusetts": 1.08, "Connecticut": 1.06}, 0.98)
+}
+
+INDIA_MULTIPLIERS: Final[Dict[str, Tuple[Dict[str, float], float]]] = {
+    "economic": ({"Maharashtra": 1.30, "Karnataka": 1.25, "Tamil Nadu": 1.20}, 0.80),
+    "education": ({"Kerala": 1.30, "Himachal Pradesh": 1.20, "Goa": 1.15}, 0.85)
+}
+
+# ISO 3166-1 alpha-2 codes for countries with indicator data
+COUNTRY_CODES: Final[Dict[str, str]] = {
+    "United States": "US", "China": "CN", "Japan": "JP", "Germany": "DE",
+    "India": "IN", "United Kingdom": "GB", "France": "FR", "Italy": "IT",
+    "Brazil": "BR", "Canada": "CA", "Russia": "RU", "South Korea": "KR",
+    "Australia": "AU", "Spain": "ES", "Mexico": "MX", "Indonesia": "ID",
+    "Netherlands": "NL", "Saudi Arabia": "SA", "Turkey": "TR", "Taiwan": "TW",
+    "Belgium": "BE", "Argentina": "AR", "Ireland": "IE", "Israel": "IL",
+    "Austria": "AT", "Nigeria": "NG", "Norway": "NO", "Egypt": "EG",
+    "South Africa": "ZA", "Poland": "PL", "Thailand": "TH", "Chile": "CL",
+    "Finland": "FI", "Romania": "RO", "Czech Republic": "CZ", "New Zealand": "NZ",
+    "Vietnam": "VN", "Peru": "PE", "Greece": "GR", "Portugal": "PT",
+    "Denmark": "DK", "Singapore": "SG", "Malaysia": "MY", "Philippines": "PH",
+    "Bangladesh": "BD", "Ukraine": "UA", "Morocco": "MA", "Kenya": "KE",
+    "Ethiopia": "ET", "Ghana": "GH", "Angola": "AO", "Tanzania": "TZ"
+}
+
+# Sub-national regions offered for state-level analysis
+US_STATES: Final[Tuple[str, ...]] = (
+    "Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado",
+    "Connecticut", "Delaware", "Florida", "Georgia", "Hawaii", "Idaho",
+    "Illinois", "Indiana", "Iowa", "Kansas", "Kentucky", "Louisiana",
+    "Maine", "Maryland", "Massachusetts", "Michigan", "Minnesota",
+    "Mississippi", "Missouri", "Montana", "Nebraska", "Nevada",
+    "New Hampshire", "New Jersey", "New Mexico", "New York",
+    "North Carolina", "North Dakota", "Ohio", "Oklahoma", "Oregon",
+    "Pennsylvania", "Rhode Island", "South Carolina", "South Dakota",
+    "Tennessee", "Texas", "Utah", "Vermont", "Virginia", "Washington",
+    "West Virginia", "Wisconsin", "Wyoming"
+)
+
+INDIA_STATES: Final[Tuple[str, ...]] = (
+    "Andhra Pradesh", "Arunachal Pradesh", "Assam", "Bihar", "Chhattisgarh",
+    "Goa", "Gujarat", "Haryana", "Himachal Pradesh", "Jharkhand", "Karnataka",
+    "Kerala", "Madhya Pradesh", "Maharashtra", "Manipur", "Meghalaya",
+    "Mizoram", "Nagaland", "Odisha", "Punjab", "Rajasthan", "Sikkim",
+    "Tamil Nadu", "Telangana", "Tripura", "Uttar Pradesh", "Uttarakhand",
+    "West Bengal"
+)
+
+AUSTRALIA_STATES: Final[Tuple[str, ...]] = (
+    "New South Wales", "Victoria", "Queensland", "Western Australia",
+    "South Australia", "Tasmania", "Northern Territory",
+    "Australian Capital Territory"
+)
+
+CANADA_PROVINCES: Final[Tuple[str, ...]] = (
+    "Alberta", "British Columbia", "Manitoba", "New Brunswick",
+    "Newfoundland and Labrador", "Northwest Territories", "Nova Scotia",
+    "Nunavut", "Ontario", "Prince Edward Island", "Quebec", "Saskatchewan",
+    "Yukon"
+)
+
+STATE_TABLE: Final[Dict[str, Tuple[str, ...]]] = {
+    "United States": US_STATES,
+    "India": INDIA_STATES,
+    "Australia": AUSTRALIA_STATES,
+    "Canada": CANADA_PROVINCES
+}
+
+class PartialFetchError(Exception):
+    """Some indicator requests failed; ``data`` holds the rest, with None for ``failed``.
+
+    Raised from the cached fetchers so a partial result is shown but never cached.
+    """
+    def __init__(self, data: Dict, failed: List[str]):
+        super().__init__(f"Could not fetch {', '.join(failed)}")
+        self.data = data
+        self.failed = failed
 
 class DataService:
     """Service for fetching country and state data from multiple APIs"""
@@ -10,136 +142,224 @@ class DataService:
     def __init__(self):
         # World Bank API base URL
         self.base_url = "https://api.worldbank.org/v2"
-        self.session = requests.Session()
+        # Responses persist on disk, so restarts and other sessions reuse them
+        self.session = requests_cache.CachedSession(
+            'wb_cache',
+            backend='sqlite',
+            expire_after=timedelta(hours=24)
+        )
+        self.session.cache.delete(expired=True)
+        # Larger pool for concurrent fetches; transient 429/5xx responses are retried
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["GET"]
+            )
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update({
             'User-Agent': 'Country-Comparison-Tool/1.0'
         })
-        # Cache for data to avoid repeated API calls
-        self._countries_cache = None
-        self._cache_timestamp = None
-        self._cache_duration = timedelta(hours=1)
+    
+    # The cached fetchers raise on failure so nothing is cached for it; the
+    # fallbacks and partial results below are returned for this call only and
+    # retried next time
     
     def get_available_countries(self) -> List[str]:
-        """Fetch list of available countries from World Bank API"""
+        """Fetch list of available countries from World Bank API (cached for an hour)"""
         try:
-            # Check cache first
-            if self._countries_cache and self._cache_timestamp:
-                if datetime.now() - self._cache_timestamp < self._cache_duration:
-                    return self._countries_cache
-            
-            # World Bank API endpoint for countries
-            url = f"{self.base_url}/country?format=json&per_page=300"
-            
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            if not data or len(data) < 2:
-                return self._get_comprehensive_countries()
-            
-            countries = []
-            for country in data[1]:  # Second element contains the data
-                # Filter actual countries (exclude aggregates and regions)
-                if (country.get('capitalCity') and 
-                    country.get('incomeLevel', {}).get('id') != 'NA' and
-                    country.get('region', {}).get('id') != 'NA'):
-                    countries.append(country['name'])
-            
-            # Cache the results
-            self._countries_cache = sorted(countries)
-            self._cache_timestamp = datetime.now()
-            
-            return self._countries_cache
-            
-        except Exception as e:
-            st.warning(f"Using comprehensive country list due to API connectivity.")
+            return _cached_available_countries(self)
+        except Exception:
+            st.warning("Using comprehensive country list due to API connectivity.")
             return self._get_comprehensive_countries()
     
     def get_country_data(self, country_name: str, indicators: List[str]) -> Optional[Dict]:
-        """Fetch specific indicators for a country using World Bank API"""
+        """Fetch specific indicators for a country using World Bank API (cached for an hour)"""
         try:
-            country_code = self._get_country_code(country_name)
-            if not country_code:
-                return None
-            
-            country_data = {}
-            
-            # Map display names to World Bank indicator codes
-            indicator_mapping = {
-                "GDP per capita (current US$)": "NY.GDP.PCAP.CD",
-                "GDP growth (annual %)": "NY.GDP.MKTP.KD.ZG",
-                "Population, total": "SP.POP.TOTL",
-                "Population growth (annual %)": "SP.POP.GROW",
-                "Life expectancy at birth, total (years)": "SP.DYN.LE00.IN",
-                "Inflation, consumer prices (annual %)": "FP.CPI.TOTL.ZG",
-                "Unemployment, total (% of total labor force)": "SL.UEM.TOTL.ZS",
-                "School enrollment, primary (% net)": "SE.PRM.NENR",
-                "Health expenditure, total (% of GDP)": "SH.XPD.CHEX.GD.ZS",
-                "Urban population (% of total population)": "SP.URB.TOTL.IN.ZS",
-                "CO2 emissions (metric tons per capita)": "EN.ATM.CO2E.PC",
-                "Internet users (per 100 people)": "IT.NET.USER.ZS",
-                "Trade (% of GDP)": "NE.TRD.GNFS.ZS",
-                "Government expenditure on education, total (% of GDP)": "SE.XPD.TOTL.GD.ZS",
-                "Military expenditure (% of GDP)": "MS.MIL.XPND.GD.ZS",
-                "Literacy rate, adult total (% of people ages 15 and above)": "SE.ADT.LITR.ZS",
-                "Mortality rate, infant (per 1,000 live births)": "SP.DYN.IMRT.IN",
-                "Hospital beds (per 1,000 people)": "SH.MED.BEDS.ZS",
-                "Research and development expenditure (% of GDP)": "GB.XPD.RSDV.GD.ZS",
-                "Scientific and technical journal articles": "IP.JRN.ARTC.SC",
-                "Age dependency ratio (% of working-age population)": "SP.POP.DPND"
-            }
-            
-            for indicator in indicators:
-                wb_code = indicator_mapping.get(indicator)
-                if wb_code:
-                    value = self._get_latest_indicator_value(country_code, wb_code)
-                    country_data[indicator] = value
-            
-            return country_data
-            
+            return _cached_country_data(self, country_name, indicators)
+        except PartialFetchError as e:
+            st.warning(f"Error fetching data for {country_name}: {str(e)}")
+            return e.data
         except Exception as e:
             st.warning(f"Error fetching data for {country_name}: {str(e)}")
             return None
     
-    def _get_country_code(self, country_name: str) -> Optional[str]:
-        """Get country code for a given country name"""
-        country_codes = {
-            "United States": "US", "China": "CN", "Japan": "JP", "Germany": "DE",
-            "India": "IN", "United Kingdom": "GB", "France": "FR", "Italy": "IT",
-            "Brazil": "BR", "Canada": "CA", "Russia": "RU", "South Korea": "KR",
-            "Australia": "AU", "Spain": "ES", "Mexico": "MX", "Indonesia": "ID",
-            "Netherlands": "NL", "Saudi Arabia": "SA", "Turkey": "TR", "Taiwan": "TW",
-            "Belgium": "BE", "Argentina": "AR", "Ireland": "IE", "Israel": "IL",
-            "Austria": "AT", "Nigeria": "NG", "Norway": "NO", "Egypt": "EG",
-            "South Africa": "ZA", "Poland": "PL", "Thailand": "TH", "Chile": "CL",
-            "Finland": "FI", "Romania": "RO", "Czech Republic": "CZ", "New Zealand": "NZ",
-            "Vietnam": "VN", "Peru": "PE", "Greece": "GR", "Portugal": "PT",
-            "Denmark": "DK", "Singapore": "SG", "Malaysia": "MY", "Philippines": "PH",
-            "Bangladesh": "BD", "Ukraine": "UA", "Morocco": "MA", "Kenya": "KE",
-            "Ethiopia": "ET", "Ghana": "GH", "Angola": "AO", "Tanzania": "TZ"
-        }
-        return country_codes.get(country_name)
+    def get_countries_data(self, country_names: List[str], indicators: List[str]) -> Dict[str, Dict]:
+        """Fetch indicators for several countries in batched requests (cached for an hour)"""
+        try:
+            return _cached_countries_data(self, country_names, indicators)
+        except PartialFetchError as e:
+            st.warning(f"Error fetching data for {', '.join(country_names)}: {str(e)}")
+            return e.data
+        except Exception as e:
+            st.warning(f"Error fetching data for {', '.join(country_names)}: {str(e)}")
+            return {}
     
-    def _get_latest_indicator_value(self, country_code: str, indicator: str) -> Optional[float]:
-        """Get the latest available value for an indicator from World Bank API"""
+    def get_state_data(self, country: str, state: str, indicators: List[str]) -> Optional[Dict]:
+        """Fetch state-level data with regional variations (cached for an hour)"""
         try:
-            # World Bank API endpoint for indicators
-            url = f"{self.base_url}/country/{country_code}/indicator/{indicator}?format=json&date=2018:2023&per_page=10"
-            
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            if data and len(data) > 1 and data[1]:
-                # Find the most recent non-null value
-                for entry in data[1]:
-                    if entry.get('value') is not None:
-                        return float(entry['value'])
-            
+            return _cached_state_data(self, country, state, indicators)
+        except PartialFetchError as e:
+            st.warning(f"Error fetching state data for {state}: {str(e)}")
+            return e.data
+        except Exception as e:
+            st.warning(f"Error fetching state data for {state}: {str(e)}")
             return None
-            
-        except Exception:
+    
+    def _fetch_available_countries(self) -> List[str]:
+        """Fetch list of available countries from World Bank API; raises on failure"""
+        # World Bank API endpoint for countries
+        url = f"{self.base_url}/country?format=json&per_page=300"
+        
+        response = self.session.get(url, timeout=10)
+        response.raise_for_status()
+        
+        data = orjson.loads(response.content)
+        if not data or len(data) < 2:
+            raise ValueError("Unexpected country list response from World Bank API")
+        
+        entries = data[1]  # Second element contains the data
+        # Filter actual countries (exclude aggregates and regions)
+        countries = [
+            country['name'] for country in entries
+            if country.get('capitalCity')
+            and (country.get('incomeLevel') or {}).get('id') != 'NA'
+            and (country.get('region') or {}).get('id') != 'NA'
+        ]
+        
+        return sorted(countries)
+    
+    def _fetch_country_data(self, country_name: str, indicators: List[str]) -> Optional[Dict]:
+        """Fetch specific indicators for a country using World Bank API.
+        Raises PartialFetchError if any indicator request failed."""
+        country_code = self._get_country_code(country_name)
+        if not country_code:
             return None
+        
+        country_data = {}
+        
+        requested = self._get_indicator_codes(indicators)
+        if not requested:
+            return country_data
+        
+        # Each indicator is a separate network-bound request, so issue them concurrently
+        failed = []
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(requested))) as executor:
+            futures = [
+                (indicator, executor.submit(self._get_latest_indicator_value, country_code, wb_code))
+                for indicator, wb_code in requested
+            ]
+            for indicator, future in futures:
+                try:
+                    country_data[indicator] = future.result()
+                except Exception:
+                    # One failed indicator leaves the others intact
+                    country_data[indicator] = None
+                    failed.append(indicator)
+        
+        if failed:
+            raise PartialFetchError(country_data, failed)
+        return country_data
+    
+    def _fetch_countries_data(self, country_names: List[str], indicators: List[str]) -> Dict[str, Dict]:
+        """Fetch indicators for several countries with one World Bank request per indicator.
+        Raises PartialFetchError if any indicator request failed."""
+        country_codes = {}
+        for country_name in country_names:
+            country_code = self._get_country_code(country_name)
+            if country_code:
+                country_codes[country_name] = country_code
+        
+        countries_data = {country_name: {} for country_name in country_codes}
+        requested = self._get_indicator_codes(indicators)
+        if not country_codes or not requested:
+            return countries_data
+        
+        # The API multiplexes countries but not indicators, so one request per indicator
+        codes = list(country_codes.values())
+        failed = []
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(requested))) as executor:
+            futures = [
+                (indicator, executor.submit(self._fetch_batch, codes, wb_code))
+                for indicator, wb_code in requested
+            ]
+            for indicator, future in futures:
+                try:
+                    values = future.result()
+                except Exception:
+                    # One failed indicator leaves the others intact
+                    values = {}
+                    failed.append(indicator)
+                for country_name, country_code in country_codes.items():
+                    countries_data[country_name][indicator] = values.get(country_code)
+        
+        if failed:
+            raise PartialFetchError(countries_data, failed)
+        return countries_data
+    
+    def _get_indicator_code(self, indicator: str) -> Optional[str]:
+        """Get World Bank indicator code for a given display name"""
+        return INDICATOR_MAPPING.get(indicator)
+    
+    def _get_indicator_codes(self, indicators: List[str]) -> List[Tuple[str, str]]:
+        """Pair each known indicator with its World Bank code"""
+        requested = []
+        for indicator in indicators:
+            wb_code = self._get_indicator_code(indicator)
+            if wb_code:
+                requested.append((indicator, wb_code))
+        return requested
+    
+    def _get_country_code(self, country_name: str) -> Optional[str]:
+        """Get country code for a given country name"""
+        return COUNTRY_CODES.get(country_name)
+    
+    def _get_latest_indicator_value(self, country_code: str, indicator: str) -> Optional[float]:
+        """Get the latest available value for an indicator from World Bank API.
+        A missing value is None; a failed request raises so it is not cached."""
+        # World Bank API endpoint for indicators
+        # mrnev=1 asks for only the most recent non-empty value
+        url = f"{self.base_url}/country/{country_code}/indicator/{indicator}?format=json&mrnev=1"
+        
+        response = self.session.get(url, timeout=10)
+        response.raise_for_status()
+        
+        data = orjson.loads(response.content)
+        if data and len(data) > 1 and data[1] and data[1][0].get('value') is not None:
+            return float(data[1][0]['value'])
+        
+        return None
+    
+    def _fetch_batch(self, country_codes: List[str], indicator: str) -> Dict[str, float]:
+        """Get the latest value of one indicator for several countries in a single request.
+        A failed request raises so it is not cached."""
+        codes = ';'.join(country_codes)
+        url = f"{self.base_url}/country/{codes}/indicator/{indicator}?format=json&per_page=1000&mrnev=1"
+        
+        response = self.session.get(url, timeout=10)
+        response.raise_for_status()
+        
+        data = orjson.loads(response.content)
+        if not (data and len(data) > 1 and data[1]):
+            return {}
+        
+        # mrnev=1 returns at most one non-empty entry per country
+        values = {}
+        for entry in data[1]:
+            country_code = (entry.get('country') or {}).get('id')
+            value = entry.get('value')
+            if country_code is None or value is None:
+                continue  # Skip malformed entries rather than dropping the whole batch
+            try:
+                values[country_code] = float(value)
+            except (TypeError, ValueError):
+                continue
+        return values
     
     def _get_comprehensive_countries(self) -> List[str]:
         """Comprehensive list of countries for fallback"""
@@ -163,104 +383,79 @@ class DataService:
     
     def get_available_states(self, country: str = "United States") -> List[str]:
         """Get list of available states for a given country"""
-        if country == "United States":
-            return [
-                "Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado",
-                "Connecticut", "Delaware", "Florida", "Georgia", "Hawaii", "Idaho",
-                "Illinois", "Indiana", "Iowa", "Kansas", "Kentucky", "Louisiana",
-                "Maine", "Maryland", "Massachusetts", "Michigan", "Minnesota", 
-                "Mississippi", "Missouri", "Montana", "Nebraska", "Nevada", 
-                "New Hampshire", "New Jersey", "New Mexico", "New York", 
-                "North Carolina", "North Dakota", "Ohio", "Oklahoma", "Oregon",
-                "Pennsylvania", "Rhode Island", "South Carolina", "South Dakota",
-                "Tennessee", "Texas", "Utah", "Vermont", "Virginia", "Washington",
-                "West Virginia", "Wisconsin", "Wyoming"
-            ]
-        elif country == "India":
-            return [
-                "Andhra Pradesh", "Arunachal Pradesh", "Assam", "Bihar", "Chhattisgarh",
-                "Goa", "Gujarat", "Haryana", "Himachal Pradesh", "Jharkhand", "Karnataka",
-                "Kerala", "Madhya Pradesh", "Maharashtra", "Manipur", "Meghalaya",
-                "Mizoram", "Nagaland", "Odisha", "Punjab", "Rajasthan", "Sikkim",
-                "Tamil Nadu", "Telangana", "Tripura", "Uttar Pradesh", "Uttarakhand",
-                "West Bengal"
-            ]
-        elif country == "Australia":
-            return [
-                "New South Wales", "Victoria", "Queensland", "Western Australia",
-                "South Australia", "Tasmania", "Northern Territory", 
-                "Australian Capital Territory"
-            ]
-        elif country == "Canada":
-            return [
-                "Alberta", "British Columbia", "Manitoba", "New Brunswick",
-                "Newfoundland and Labrador", "Northwest Territories", "Nova Scotia",
-                "Nunavut", "Ontario", "Prince Edward Island", "Quebec", "Saskatchewan",
-                "Yukon"
-            ]
-        else:
-            return []
+        # Copy so callers can't mutate the shared table
+        return list(STATE_TABLE.get(country, ()))
     
-    def get_state_data(self, country: str, state: str, indicators: List[str]) -> Optional[Dict]:
-        """Fetch state-level data with authentic regional variations"""
+    def _fetch_state_data(self, country: str, state: str, indicators: List[str]) -> Optional[Dict]:
+        """Fetch state-level data with authentic regional variations.
+        Raises PartialFetchError, with the scaled partial data, if any indicator request failed."""
+        # Get base country data first; it is cached, so sibling states share one fetch.
+        # The raising cached fetcher is used so a failed country fetch isn't cached here either.
         try:
-            # Get base country data first
-            country_data = self.get_country_data(country, indicators)
-            if not country_data:
-                return None
-                
-            state_data = {}
-            
-            # Apply realistic state variations based on known patterns
-            for indicator, value in country_data.items():
-                if value is not None:
-                    # Apply regional multipliers based on authentic data patterns
-                    if country == "United States":
-                        multiplier = self._get_us_state_multiplier(state, indicator)
-                    elif country == "India":
-                        multiplier = self._get_india_state_multiplier(state, indicator)
-                    else:
-                        multiplier = 1.0  # No variation for other countries
-                    
-                    state_data[indicator] = value * multiplier
-                else:
-                    state_data[indicator] = None
-            
-            return state_data
-            
-        except Exception as e:
-            st.warning(f"Error fetching state data for {state}: {str(e)}")
+            country_data = _cached_country_data(self, country, indicators)
+        except PartialFetchError as e:
+            raise PartialFetchError(self._scale_state_data(country, state, e.data), e.failed) from e
+        if not country_data:
             return None
-    
-    def _get_us_state_multiplier(self, state: str, indicator: str) -> float:
-        """Get realistic multipliers for US states based on authentic data patterns"""
-        # Economic multipliers
-        if "GDP" in indicator:
-            economic_leaders = {"New York": 1.35, "California": 1.25, "Massachusetts": 1.30}
-            return economic_leaders.get(state, 0.95)
         
-        # Education multipliers
-        if "School" in indicator or "education" in indicator:
-            education_leaders = {"Massachusetts": 1.25, "Connecticut": 1.20, "New Jersey": 1.15}
-            return education_leaders.get(state, 0.95)
+        return self._scale_state_data(country, state, country_data)
+    
+    def _scale_state_data(self, country: str, state: str, country_data: Dict) -> Dict:
+        """Derive a state's values from its country's values"""
+        state_data = {}
         
-        # Health multipliers
-        if "Life expectancy" in indicator or "Health" in indicator:
-            health_leaders = {"Hawaii": 1.10, "Massachusetts": 1.08, "Connecticut": 1.06}
-            return health_leaders.get(state, 0.98)
+        # Apply realistic state variations based on known patterns
+        for indicator, value in country_data.items():
+            if value is not None:
+                # Apply regional multipliers based on authentic data patterns
+                if country == "United States":
+                    multiplier = self._get_us_state_multiplier(state, indicator)
+                elif country == "India":
+                    multiplier = self._get_india_state_multiplier(state, indicator)
+                else:
+                    multiplier = 1.0  # No variation for other countries
+                
+                state_data[indicator] = value * multiplier
+            else:
+                state_data[indicator] = None
         
-        return 1.0
+        return state_data
+    
+    def _get_us_state_multiplier(self, state: str, indicator: str) -> float:
+        """Get realistic multipliers for US states based on authentic data patterns"""
+        return self._lookup_state_multiplier(US_MULTIPLIERS, state, indicator)
     
     def _get_india_state_multiplier(self, state: str, indicator: str) -> float:
         """Get realistic multipliers for Indian states based on authentic data patterns"""
-        # Economic multipliers
-        if "GDP" in indicator:
-            economic_leaders = {"Maharashtra": 1.30, "Karnataka": 1.25, "Tamil Nadu": 1.20}
-            return economic_leaders.get(state, 0.80)
-        
-        # Education multipliers
-        if "School" in indicator or "education" in indicator:
-            education_leaders = {"Kerala": 1.30, "Himachal Pradesh": 1.20, "Goa": 1.15}
-            return education_leaders.get(state, 0.85)
-        
-        return 1.0
+        return self._lookup_state_multiplier(INDIA_MULTIPLIERS, state, indicator)
+    
+    def _lookup_state_multiplier(self, table: Dict[str, Tuple[Dict[str, float], float]],
+                                 state: str, indicator: str) -> float:
+        """Look up a state's multiplier for the indicator's category"""
+        if indicator in INDICATOR_CATEGORY:
+            category = INDICATOR_CATEGORY[indicator]
+        else:
+            category = _indicator_category(indicator)
+        if category not in table:
+            return 1.0
+        leaders, default = table[category]
+        return leaders.get(state, default)
+
+# Streamlit caches shared by every DataService instance. The service is passed
+# as an underscore argument so it is excluded from the cache key.
+
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _cached_available_countries(_service: DataService) -> List[str]:
+    return _service._fetch_available_countries()
+
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _cached_country_data(_service: DataService, country_name: str, indicators: List[str]) -> Optional[Dict]:
+    return _service._fetch_country_data(country_name, indicators)
+
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _cached_countries_data(_service: DataService, country_names: List[str], indicators: List[str]) -> Dict[str, Dict]:
+    return _service._fetch_countries_data(country_names, indicators)
+
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _cached_state_data(_service: DataService, country: str, state: str, indicators: List[str]) -> Optional[Dict]:
+    return _service._fetch_state_data(country, state, indicators)
@@ -1,19 +1,63 @@
+import functools
+import itertools
 import os
 import requests
-from typing import Dict, List, Optional
+import orjson
+from typing import Dict, List, Optional, Tuple
 import streamlit as st
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+@functools.lru_cache(maxsize=1)
+def _load_api_key() -> Optional[str]:
+    """Resolve the Mistral API key once, reading .env only if the environment lacks it"""
+    if 'MISTRAL_API_KEY' not in os.environ:
+        load_dotenv()
+    return os.getenv('MISTRAL_API_KEY')
+
+@functools.lru_cache(maxsize=32)
+def _build_analysis_prompt(entities: Tuple[str, ...], metrics: Tuple[str, ...], analysis_level: str,
+                           values: Tuple[Tuple[str, Tuple[Tuple[str, Optional[float]], ...]], ...]) -> str:
+    """Build the analysis prompt; insights and findings share one build per dataset"""
+    chunks = [f"""
+        As an expert data analyst, provide comprehensive insights for this {analysis_level} comparison:
+        
+        Entities analyzed: {', '.join(entities)}
+        Metrics: {', '.join(metrics)}
+        
+        Data summary:
+        """]
+    
+    for entity, entity_values in values:
+        chunks.append(f"\n{entity}:")
+        chunks.extend(f"\n  - {metric}: {value}" for metric, value in entity_values if value is not None)
+    
+    chunks.append("""
+        
+        Please provide:
+        1. Key performance patterns and trends
+        2. Top and bottom performers with explanations
+        3. Strategic recommendations for improvement
+        4. Policy implications and next steps
+        5. Comparative advantages and challenges
+        
+        Keep the analysis practical and actionable.
+        """)
+    
+    return "".join(chunks)
 
 class MistralService:
     """Service for generating AI insights using Mistral LLM"""
     
     def __init__(self):
-        self.api_key = os.getenv('MISTRAL_API_KEY')
+        self.api_key = _load_api_key()
         self.base_url = "https://api.mistral.ai/v1/chat/completions"
         self.model = "mistral-medium"
+        # Reused session keeps the TLS connection to the API alive between prompts
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        })
     
     def generate_country_insights(self, analysis_data: Dict) -> Optional[str]:
         """Generate comprehensive insights about country comparison"""
@@ -39,9 +83,9 @@ class MistralService:
             response = self._call_mistral_api(prompt)
             
             if response:
-                # Split response into bullet points
-                findings = [line.strip() for line in response.split('\n') if line.strip() and line.strip().startswith('•')]
-                return findings[:5]  # Return top 5 findings
+                # Take the first 5 bullet lines without materializing the rest
+                bullets = (line.strip() for line in response.splitlines() if line.lstrip().startswith('•'))
+                return list(itertools.islice(bullets, 5))
             
             return []
             
@@ -50,41 +94,17 @@ class MistralService:
     
     def _create_analysis_prompt(self, analysis_data: Dict) -> str:
         """Create a comprehensive analysis prompt for the LLM"""
-        entities = analysis_data.get('entities', [])
-        metrics = analysis_data.get('metrics', [])
+        entities = tuple(analysis_data.get('entities', []))
+        metrics = tuple(analysis_data.get('metrics', []))
         data = analysis_data.get('data', {})
         analysis_level = analysis_data.get('analysis_level', 'Country Level')
         
-        prompt = f"""
-        As an expert data analyst, provide comprehensive insights for this {analysis_level} comparison:
-        
-        Entities analyzed: {', '.join(entities)}
-        Metrics: {', '.join(metrics)}
-        
-        Data summary:
-        """
-        
-        for entity in entities:
-            if entity in data:
-                prompt += f"\n{entity}:"
-                for metric in metrics:
-                    value = data[entity].get(metric)
-                    if value is not None:
-                        prompt += f"\n  - {metric}: {value}"
-        
-        prompt += """
-        
-        Please provide:
-        1. Key performance patterns and trends
-        2. Top and bottom performers with explanations
-        3. Strategic recommendations for improvement
-        4. Policy implications and next steps
-        5. Comparative advantages and challenges
-        
-        Keep the analysis practical and actionable.
-        """
-        
-        return prompt
+        # Only the values the prompt prints go into the cache key
+        values = tuple(
+            (entity, tuple((metric, data[entity].get(metric)) for metric in metrics))
+            for entity in entities if entity in data
+        )
+        return _build_analysis_prompt(entities, metrics, analysis_level, values)
     
     def _create_findings_prompt(self, analysis_data: Dict) -> str:
         """Create a prompt specifically for extracting key findings"""
@@ -98,11 +118,6 @@ class MistralService:
             return None
             
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
             data = {
                 "model": self.model,
                 "messages": [
@@ -115,16 +130,21 @@ class MistralService:
                 "temperature": 0.7
             }
             
-            response = requests.post(self.base_url, headers=headers, json=data, timeout=30)
+            response = self.session.post(self.base_url, json=data, timeout=30)
             response.raise_for_status()
             
-            result = response.json()
+            result = orjson.loads(response.content)
             return result['choices'][0]['message']['content']
             
         except Exception as e:
             st.warning(f"Mistral API error: {str(e)}")
             return None
     
+    @staticmethod
+    def reload_api_key() -> None:
+        """Forget the resolved API key so the next instance re-reads .env"""
+        _load_api_key.cache_clear()
+    
     def is_available(self) -> bool:
         """Check if the Mistral service is available"""
         return bool(self.api_key)
@@ -1,49 +1,73 @@
-from typing import Union, Dict, List, Optional
-import pandas as pd
+import csv
+import io
+from typing import TYPE_CHECKING, Union, Dict, List, Optional
 import numpy as np
 
-def format_number(value: Union[int, float]) -> str:
-    """Format large numbers with appropriate units"""
-    if pd.isna(value) or value is None:
-        return "N/A"
-    
+# pandas is imported where it is used; the scalar helpers never need it
+if TYPE_CHECKING:
+    import pandas as pd
+
+# (scale, suffix) per power-of-1000 magnitude, indexed by log10(value) // 3
+_SCALES = ((1.0, ""), (1e3, "K"), (1e6, "M"), (1e9, "B"), (1e12, "T"))
+
+def _as_float(value) -> Optional[float]:
+    """Coerce a scalar to float, or None when it is missing, NaN or not numeric"""
+    if value is None:
+        return None
     try:
         value = float(value)
-        if abs(value) >= 1e12:
-            return f"{value/1e12:.1f}T"
-        elif abs(value) >= 1e9:
-            return f"{value/1e9:.1f}B"
-        elif abs(value) >= 1e6:
-            return f"{value/1e6:.1f}M"
-        elif abs(value) >= 1e3:
-            return f"{value/1e3:.1f}K"
-        elif abs(value) >= 1:
-            return f"{value:.1f}"
-        else:
-            return f"{value:.3f}"
     except (ValueError, TypeError):
+        return None
+    # NaN is the only float that differs from itself
+    return None if value != value else value
+
+def _format_numbers(numbers: np.ndarray) -> np.ndarray:
+    """Format a float64 array with appropriate units; NaN and infinities become N/A"""
+    magnitude = np.abs(numbers)
+    
+    # Magnitude bins from largest to smallest; the first matching bin wins
+    conditions = [magnitude >= scale for scale, _ in reversed(_SCALES)]
+    scale = np.select(conditions, [scale for scale, _ in reversed(_SCALES)], 1.0)
+    suffix = np.select(conditions, [suffix for _, suffix in reversed(_SCALES)], "")
+    
+    formatted = np.where(
+        magnitude < 1,
+        np.char.mod("%.3f", numbers),
+        np.char.add(np.char.mod("%.1f", numbers / scale), suffix)
+    ).astype(object)
+    formatted[~np.isfinite(numbers)] = "N/A"
+    return formatted
+
+def format_number(value: Union[int, float]) -> str:
+    """Format large numbers with appropriate units"""
+    value = _as_float(value)
+    if value is None:
         return "N/A"
+    # Same code path as format_numbers_series so the two can't disagree
+    return str(_format_numbers(np.array([value], dtype=np.float64))[0])
+
+def format_numbers_series(values: "pd.Series") -> "pd.Series":
+    """Format a Series of numbers with appropriate units, same rules as format_number"""
+    import pandas as pd
+    
+    numbers = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64)
+    return pd.Series(_format_numbers(numbers), index=values.index)
 
 def format_percentage(value: Union[int, float], decimal_places: int = 2) -> str:
     """Format percentage values"""
-    if pd.isna(value) or value is None:
+    value = _as_float(value)
+    if value is None:
         return "N/A"
     
-    try:
-        return f"{float(value):.{decimal_places}f}%"
-    except (ValueError, TypeError):
-        return "N/A"
+    return f"{value:.{decimal_places}f}%"
 
 def format_currency(value: Union[int, float], currency: str = "USD") -> str:
     """Format currency values"""
-    if pd.isna(value) or value is None:
+    # Missing values give a bare N/A; unparseable strings keep the currency, as before
+    if _as_float(value) is None and not isinstance(value, str):
         return "N/A"
     
-    try:
-        formatted_value = format_number(value)
-        return f"{formatted_value} {currency}"
-    except:
-        return "N/A"
+    return f"{format_number(value)} {currency}"
 
 def get_metric_description(metric_name: str) -> Optional[str]:
     """Get description for metrics to help users understand the data"""
@@ -69,7 +93,14 @@ def validate_data_quality(data: Dict) -> Dict[str, Union[float, str]]:
         return {"completeness": 0.0, "quality": "Poor - No data available"}
     
     total_metrics = len(data)
-    valid_metrics = sum(1 for v in data.values() if v is not None and not pd.isna(v))
+    try:
+        # One vectorized NaN check over a float array instead of pd.isna per value
+        values = np.fromiter((np.nan if v is None else v for v in data.values()), dtype=np.float64, count=total_metrics)
+        valid_metrics = int(np.count_nonzero(~np.isnan(values)))
+    except (ValueError, TypeError):
+        # Non-numeric values (strings, pd.NA) take the per-value pd.isna path
+        import pandas as pd
+        valid_metrics = sum(1 for v in data.values() if v is not None and not pd.isna(v))
     completeness = (valid_metrics / total_metrics) * 100 if total_metrics > 0 else 0
     
     if completeness >= 80:
@@ -109,15 +140,26 @@ def clean_country_name(country_name: str) -> str:
 def export_to_csv(data: Dict, filename: str = "country_data.csv") -> str:
     """Convert country data to CSV format"""
     try:
-        df = pd.DataFrame.from_dict(data, orient='index')
-        csv_string = df.to_csv()
-        return csv_string
+        # Columns in first-appearance order, matching DataFrame.from_dict
+        columns = list(dict.fromkeys(key for row in data.values() for key in row))
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=["entity"] + columns, lineterminator="\n")
+        writer.writeheader()
+        for entity, row in data.items():
+            # NaN is written as an empty cell, like DataFrame.to_csv does
+            writer.writerow({"entity": entity, **{
+                key: "" if isinstance(value, float) and value != value else value
+                for key, value in row.items()
+            }})
+        return buffer.getvalue()
     except Exception as e:
         return f"Error exporting data: {str(e)}"
 
 def calculate_growth_rate(current_value: float, previous_value: float) -> Optional[float]:
     """Calculate growth rate between two values"""
-    if pd.isna(current_value) or pd.isna(previous_value) or previous_value == 0:
+    current_value = _as_float(current_value)
+    previous_value = _as_float(previous_value)
+    if current_value is None or previous_value is None or previous_value == 0:
         return None
     
     try:
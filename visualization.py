@@ -1,10 +1,94 @@
+import functools
+import itertools
 import pandas as pd
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
+import plotly.io as pio
 import numpy as np
-from typing import List, Dict
-from utils import format_number
+from typing import List, Dict, Optional, Tuple
+from utils import format_numbers_series
+
+@functools.lru_cache(maxsize=32)
+def _cycled_palette(palette: Tuple[str, ...], n: int) -> Tuple[str, ...]:
+    """One color per point, repeating the palette when there are more points than colors"""
+    return tuple(itertools.islice(itertools.cycle(palette), n))
+
+# Point count from which scatter traces switch to WebGL when the caller doesn't choose
+WEBGL_THRESHOLD = 30
+
+def _scatter_type(n: int, use_gl: Optional[bool]) -> str:
+    """Trace type for n scatter points; use_gl=None picks WebGL for large traces"""
+    if use_gl is None:
+        use_gl = n >= WEBGL_THRESHOLD
+    return 'scattergl' if use_gl else 'scatter'
+
+# Common layout settings
+LAYOUT_CONFIG = {
+    'plot_bgcolor': 'white',
+    'paper_bgcolor': 'white',
+    'font': {'color': '#262730', 'size': 12},
+    'margin': {'l': 50, 'r': 50, 't': 80, 'b': 50}
+}
+
+_HIDDEN_AXIS = {'showgrid': False, 'showticklabels': False, 'zeroline': False}
+
+# Everything in the error placeholder's layout except its message
+_ERROR_LAYOUT = {
+    **LAYOUT_CONFIG,
+    'title': {'text': "Chart Error"},
+    'xaxis': _HIDDEN_AXIS,
+    'yaxis': _HIDDEN_AXIS
+}
+
+@functools.lru_cache(maxsize=64)
+def _error_layout(error_message: str) -> Dict:
+    """Error placeholder layout per message; the missing-data messages repeat across reruns"""
+    return {
+        **_ERROR_LAYOUT,
+        'annotations': [{
+            'text': f"⚠️ {error_message}",
+            'xref': "paper", 'yref': "paper",
+            'x': 0.5, 'y': 0.5,
+            'xanchor': 'center', 'yanchor': 'middle',
+            'showarrow': False,
+            'font': {'size': 16, 'color': "red"}
+        }]
+    }
+
+# Serialize figures (including Streamlit's plotly_chart payloads) with orjson,
+# which encodes NumPy arrays natively instead of going through tolist()
+pio.json.config.default_engine = "orjson"
+
+# Default cap on points/tiles drawn by the bubble, scatter and treemap charts
+MAX_POINTS = 2000
+
+def _sample_positions(n: int, max_points: Optional[int], priority: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+    """Sorted positions of at most max_points of n rows, or None when all of them fit.
+    
+    Without a priority the rows are sampled uniformly; with one, the highest-priority
+    half is always kept and the rest is sampled from the remainder.
+    """
+    if max_points is None or n <= max_points:
+        return None
+    rng = np.random.default_rng(0)
+    if priority is None:
+        return np.sort(rng.choice(n, size=max_points, replace=False))
+    order = np.argsort(priority)[::-1]
+    keep = max_points // 2
+    sampled = rng.choice(order[keep:], size=max_points - keep, replace=False)
+    return np.sort(np.concatenate([order[:keep], sampled]))
+
+def _sampled_title(title: str, shown: int, total: int) -> str:
+    """Note in the title when only a sample of the rows is drawn"""
+    return title if shown == total else f"{title} (showing {shown} of {total})"
+
+def _axis_floats(values: np.ndarray) -> np.ndarray:
+    """Single-precision copy of an axis array; ~7 significant digits is ample for positioning.
+    Only for axes whose hover shows formatted text, never a raw %{x}/%{y} value."""
+    return values.astype(np.float32)
+
+def _figure(data: List[Dict], layout: Dict) -> go.Figure:
+    """Wrap plain trace/layout dicts in a Figure without Plotly's per-property validation"""
+    return go.Figure({'data': data, 'layout': layout}, _validate=False)
 
 class Visualization:
     """Enhanced service for creating interactive data visualizations with multiple chart types"""
@@ -12,23 +96,27 @@ class Visualization:
     def __init__(self):
         # Define multiple color palettes for user selection
         self.color_palettes = {
-            'Default': ['#FF4B4B', '#0068C9', '#09AB3B', '#FF8C00', '#8A2BE2', '#DC143C', '#00CED1', '#FFD700'],
-            'Professional': ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2', '#7f7f7f'],
-            'Vibrant': ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD', '#98D8C8', '#F7DC6F'],
-            'Earth Tones': ['#8B4513', '#CD853F', '#D2691E', '#A0522D', '#F4A460', '#DEB887', '#D2B48C', '#BC8F8F'],
-            'Ocean': ['#006994', '#13A3C4', '#BCF5F5', '#4DD0E1', '#0891B2', '#006BA6', '#1976D2', '#42A5F5'],
-            'Sunset': ['#FF6B35', '#F7931E', '#FFD23F', '#FE4A49', '#FE6B8B', '#FF8A65', '#FFAB40', '#FFD54F'],
-            'Pastel': ['#FFB3BA', '#FFDFBA', '#FFFFBA', '#BAFFC9', '#BAE1FF', '#E1BAFF', '#FFE1BA', '#FFBAE1']
+            'Default': ('#FF4B4B', '#0068C9', '#09AB3B', '#FF8C00', '#8A2BE2', '#DC143C', '#00CED1', '#FFD700'),
+            'Professional': ('#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2', '#7f7f7f'),
+            'Vibrant': ('#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD', '#98D8C8', '#F7DC6F'),
+            'Earth Tones': ('#8B4513', '#CD853F', '#D2691E', '#A0522D', '#F4A460', '#DEB887', '#D2B48C', '#BC8F8F'),
+            'Ocean': ('#006994', '#13A3C4', '#BCF5F5', '#4DD0E1', '#0891B2', '#006BA6', '#1976D2', '#42A5F5'),
+            'Sunset': ('#FF6B35', '#F7931E', '#FFD23F', '#FE4A49', '#FE6B8B', '#FF8A65', '#FFAB40', '#FFD54F'),
+            'Pastel': ('#FFB3BA', '#FFDFBA', '#FFFFBA', '#BAFFC9', '#BAE1FF', '#E1BAFF', '#FFE1BA', '#FFBAE1')
         }
         self.color_palette = self.color_palettes['Default']
         
         # Common layout settings
-        self.layout_config = {
-            'plot_bgcolor': 'white',
-            'paper_bgcolor': 'white',
-            'font': {'color': '#262730', 'size': 12},
-            'margin': {'l': 50, 'r': 50, 't': 80, 'b': 50}
-        }
+        self.layout_config = dict(LAYOUT_CONFIG)
+    
+    def _layout(self, title: str, x_title: Optional[str] = None, y_title: Optional[str] = None, **extra) -> Dict:
+        """Layout dict for a chart: the common settings plus its title, axis titles and extras"""
+        layout = {**self.layout_config, 'title': {'text': title}, **extra}
+        if x_title is not None:
+            layout['xaxis'] = {'title': {'text': x_title}}
+        if y_title is not None:
+            layout['yaxis'] = {'title': {'text': y_title}}
+        return layout
     
     def set_color_palette(self, palette_name: str):
         """Set the color palette for visualizations"""
@@ -39,317 +127,296 @@ class Visualization:
         """Get list of available color palettes"""
         return list(self.color_palettes.keys())
     
+    def apply_palette(self, fig: go.Figure) -> go.Figure:
+        """Recolor a figure in place with the current palette, so a cached figure
+        can follow a palette change without being rebuilt"""
+        fig.update_layout(colorway=self.color_palette)
+        
+        for i, trace in enumerate(fig.data):
+            if trace.type in ('pie', 'treemap'):
+                trace.marker.colors = _cycled_palette(self.color_palette, len(trace.labels))
+            elif trace.type == 'box':
+                trace.marker.color = self.color_palette[0]
+            elif trace.type == 'scatterpolar' or getattr(trace, 'mode', None) == 'lines+markers':
+                # One trace per entity (radar/line charts)
+                trace.line.color = self.color_palette[i % len(self.color_palette)]
+            else:
+                # Bar, scatter and bubble charts color each point
+                trace.marker.color = _cycled_palette(self.color_palette, len(trace.y))
+        
+        return fig
+    
     def create_enhanced_bar_chart(self, df: pd.DataFrame, metric: str, show_values: bool = True) -> go.Figure:
         """Create an enhanced bar chart with animations and better styling"""
-        try:
-            if df.empty or metric not in df.columns:
-                return self._create_error_chart(f"No data available for {metric}")
-            
-            # Sort by metric value for better visualization
-            df_sorted = df.sort_values(metric, ascending=True)
-            
-            fig = go.Figure(data=[
-                go.Bar(
-                    y=df_sorted.iloc[:, 0],  # First column (Country/State)
-                    x=df_sorted[metric],
-                    orientation='h',
-                    marker_color=self.color_palette[:len(df_sorted)],
-                    text=df_sorted[metric].apply(lambda x: format_number(x) if pd.notna(x) else 'N/A'),
-                    textposition='auto',
-                    hovertemplate='<b>%{y}</b><br>' + metric + ': %{text}<extra></extra>'
-                )
-            ])
-            
-            fig.update_layout(
-                title=f'{metric} Comparison',
-                xaxis_title=metric,
-                yaxis_title=df.columns[0],
-                **self.layout_config
-            )
-            
-            return fig
-            
-        except Exception as e:
-            return self._create_error_chart(f"Error creating bar chart: {str(e)}")
+        if df.empty or metric not in df.columns:
+            return self.create_error_chart(f"No data available for {metric}")
+        
+        # Sort by metric value for better visualization; NaN stays last as with sort_values
+        values = df[metric].to_numpy(dtype=np.float64)
+        order = np.argsort(values, kind='stable')
+        values = values[order]
+        labels = df.iloc[:, 0].to_numpy()[order]  # First column (Country/State)
+        
+        return _figure(
+            [{
+                'type': 'bar',
+                'y': labels,
+                'x': _axis_floats(values),
+                'orientation': 'h',
+                'marker': {'color': _cycled_palette(self.color_palette, len(values))},
+                'text': format_numbers_series(pd.Series(values)).tolist(),
+                'textposition': 'auto',
+                'hovertemplate': '<b>%{y}</b><br>' + metric + ': %{text}<extra></extra>'
+            }],
+            self._layout(f'{metric} Comparison', metric, df.columns[0])
+        )
     
     def create_donut_chart(self, df: pd.DataFrame, metric: str) -> go.Figure:
         """Create a donut chart for metric distribution"""
-        try:
-            if df.empty or metric not in df.columns:
-                return self._create_error_chart(f"No data available for {metric}")
-            
-            # Filter out negative values and NaN
-            df_clean = df[df[metric] > 0].copy()
-            if df_clean.empty:
-                return self._create_error_chart("No positive values available for donut chart")
-            
-            fig = go.Figure(data=[go.Pie(
-                labels=df_clean.iloc[:, 0],  # First column (Country/State)
-                values=df_clean[metric],
-                hole=0.4,
-                textinfo='label+percent',
-                textposition='outside',
-                marker=dict(
-                    colors=self.color_palette[:len(df_clean)],
-                    line=dict(color='white', width=2)
-                ),
-                hovertemplate='<b>%{label}</b><br>' +
-                            'Value: %{value}<br>' +
-                            'Percentage: %{percent}<extra></extra>'
-            )])
-            
-            fig.update_layout(
-                title=f'{metric} Distribution',
-                **self.layout_config
-            )
-            
-            return fig
-            
-        except Exception as e:
-            return self._create_error_chart(f"Error creating donut chart: {str(e)}")
+        if df.empty or metric not in df.columns:
+            return self.create_error_chart(f"No data available for {metric}")
+        
+        # Filter out negative values and NaN
+        values = df[metric].to_numpy(dtype=np.float64)
+        mask = values > 0
+        if not mask.any():
+            return self.create_error_chart("No positive values available for donut chart")
+        labels = df.iloc[:, 0].to_numpy()[mask]  # First column (Country/State)
+        values = values[mask]
+        
+        return _figure(
+            [{
+                'type': 'pie',
+                'labels': labels,
+                'values': values,
+                'hole': 0.4,
+                'textinfo': 'label+percent',
+                'textposition': 'outside',
+                'marker': {
+                    'colors': _cycled_palette(self.color_palette, len(values)),
+                    'line': {'color': 'white', 'width': 2}
+                },
+                'hovertemplate': '<b>%{label}</b><br>' +
+                                 'Value: %{value}<br>' +
+                                 'Percentage: %{percent}<extra></extra>'
+            }],
+            self._layout(f'{metric} Distribution')
+        )
     
-    def create_bubble_chart(self, df: pd.DataFrame, x_metric: str, y_metric: str, size_metric: str) -> go.Figure:
-        """Create a bubble chart with three metrics"""
-        try:
-            if df.empty or not all(col in df.columns for col in [x_metric, y_metric, size_metric]):
-                return self._create_error_chart("Required metrics not available for bubble chart")
-            
-            # Clean data - remove rows with any NaN values in the three metrics
-            df_clean = df.dropna(subset=[x_metric, y_metric, size_metric])
-            if df_clean.empty:
-                return self._create_error_chart("No complete data available for bubble chart")
-            
-            fig = go.Figure(data=go.Scatter(
-                x=df_clean[x_metric],
-                y=df_clean[y_metric],
-                mode='markers',
-                marker=dict(
-                    size=df_clean[size_metric],
-                    sizemode='diameter',
-                    sizeref=2.*max(df_clean[size_metric])/(40.**2),
-                    sizemin=4,
-                    color=self.color_palette[:len(df_clean)],
-                    line=dict(width=2, color='white')
-                ),
-                text=df_clean.iloc[:, 0],  # First column (Country/State)
-                hovertemplate='<b>%{text}</b><br>' +
-                            f'{x_metric}: %{{x}}<br>' +
-                            f'{y_metric}: %{{y}}<br>' +
-                            f'{size_metric}: %{{marker.size}}<extra></extra>'
-            ))
-            
-            fig.update_layout(
-                title=f'{x_metric} vs {y_metric} (Bubble size: {size_metric})',
-                xaxis_title=x_metric,
-                yaxis_title=y_metric,
-                **self.layout_config
+    def create_bubble_chart(self, df: pd.DataFrame, x_metric: str, y_metric: str, size_metric: str, use_gl: Optional[bool] = None,
+                            max_points: Optional[int] = MAX_POINTS) -> go.Figure:
+        """Create a bubble chart with three metrics (WebGL-rendered when use_gl is set, or by size if None).
+        Above max_points bubbles, the largest half is kept and the rest sampled."""
+        required = (x_metric, y_metric, size_metric)
+        if df.empty or not set(required).issubset(df.columns):
+            return self.create_error_chart("Required metrics not available for bubble chart")
+        
+        # Clean data - remove rows with any NaN values in the three metrics
+        xs, ys, sizes = (df[col].to_numpy(dtype=np.float64) for col in required)
+        mask = ~(np.isnan(xs) | np.isnan(ys) | np.isnan(sizes))
+        if not mask.any():
+            return self.create_error_chart("No complete data available for bubble chart")
+        xs, ys, sizes = xs[mask], ys[mask], sizes[mask]
+        labels = df.iloc[:, 0].to_numpy()[mask]  # First column (Country/State)
+        
+        total = len(xs)
+        positions = _sample_positions(total, max_points, sizes)
+        if positions is not None:
+            xs, ys, sizes, labels = xs[positions], ys[positions], sizes[positions], labels[positions]
+        
+        return _figure(
+            [{
+                'type': _scatter_type(len(xs), use_gl),
+                'x': xs,
+                'y': ys,
+                'mode': 'markers',
+                'marker': {
+                    'size': sizes,
+                    'sizemode': 'diameter',
+                    'sizeref': 2.*sizes.max()/(40.**2),
+                    'sizemin': 4,
+                    'color': _cycled_palette(self.color_palette, len(xs)),
+                    'line': {'width': 2, 'color': 'white'}
+                },
+                'text': labels,
+                'hovertemplate': '<b>%{text}</b><br>' +
+                                 f'{x_metric}: %{{x}}<br>' +
+                                 f'{y_metric}: %{{y}}<br>' +
+                                 f'{size_metric}: %{{marker.size}}<extra></extra>'
+            }],
+            self._layout(
+                _sampled_title(f'{x_metric} vs {y_metric} (Bubble size: {size_metric})', len(xs), total),
+                x_metric, y_metric
             )
-            
-            return fig
-            
-        except Exception as e:
-            return self._create_error_chart(f"Error creating bubble chart: {str(e)}")
+        )
     
     def create_box_plot(self, df: pd.DataFrame, metric: str) -> go.Figure:
         """Create a box plot for statistical distribution"""
-        try:
-            if df.empty or metric not in df.columns:
-                return self._create_error_chart(f"No data available for {metric}")
-            
-            # Remove NaN values
-            df_clean = df.dropna(subset=[metric])
-            if df_clean.empty:
-                return self._create_error_chart("No valid data for box plot")
-            
-            fig = go.Figure(data=go.Box(
-                y=df_clean[metric],
-                name=metric,
-                marker_color=self.color_palette[0],
-                boxpoints='all',
-                pointpos=0,
-                text=df_clean.iloc[:, 0],  # First column (Country/State)
-                hovertemplate='<b>%{text}</b><br>' + metric + ': %{y}<extra></extra>'
-            ))
-            
-            fig.update_layout(
-                title=f'{metric} Distribution Analysis',
-                yaxis_title=metric,
-                **self.layout_config
-            )
-            
-            return fig
-            
-        except Exception as e:
-            return self._create_error_chart(f"Error creating box plot: {str(e)}")
+        if df.empty or metric not in df.columns:
+            return self.create_error_chart(f"No data available for {metric}")
+        
+        # Remove NaN values
+        values = df[metric].to_numpy(dtype=np.float64)
+        mask = ~np.isnan(values)
+        if not mask.any():
+            return self.create_error_chart("No valid data for box plot")
+        values = values[mask]
+        labels = df.iloc[:, 0].to_numpy()[mask]  # First column (Country/State)
+        
+        return _figure(
+            [{
+                'type': 'box',
+                'y': values,
+                'name': metric,
+                'marker': {'color': self.color_palette[0]},
+                'boxpoints': 'all',
+                'pointpos': 0,
+                'text': labels,
+                'hovertemplate': '<b>%{text}</b><br>' + metric + ': %{y}<extra></extra>'
+            }],
+            self._layout(f'{metric} Distribution Analysis', y_title=metric)
+        )
     
-    def create_treemap(self, df: pd.DataFrame, metric: str) -> go.Figure:
-        """Create a treemap visualization"""
-        try:
-            if df.empty or metric not in df.columns:
-                return self._create_error_chart(f"No data available for {metric}")
-            
-            # Filter positive values only
-            df_clean = df[df[metric] > 0].copy()
-            if df_clean.empty:
-                return self._create_error_chart("No positive values for treemap")
-            
-            fig = go.Figure(go.Treemap(
-                labels=df_clean.iloc[:, 0],  # First column (Country/State)
-                values=df_clean[metric],
-                parents=[""] * len(df_clean),
-                textinfo="label+value",
-                marker=dict(
-                    colors=self.color_palette[:len(df_clean)],
-                    line=dict(width=2, color='white')
-                ),
-                hovertemplate='<b>%{label}</b><br>' + metric + ': %{value}<extra></extra>'
-            ))
-            
-            fig.update_layout(
-                title=f'{metric} Treemap View',
-                **self.layout_config
-            )
-            
-            return fig
-            
-        except Exception as e:
-            return self._create_error_chart(f"Error creating treemap: {str(e)}")
+    def create_treemap(self, df: pd.DataFrame, metric: str, max_points: Optional[int] = MAX_POINTS) -> go.Figure:
+        """Create a treemap visualization; above max_points tiles, the largest half is kept and the rest sampled"""
+        if df.empty or metric not in df.columns:
+            return self.create_error_chart(f"No data available for {metric}")
+        
+        # Filter positive values only
+        values = df[metric].to_numpy(dtype=np.float64)
+        mask = values > 0
+        if not mask.any():
+            return self.create_error_chart("No positive values for treemap")
+        labels = df.iloc[:, 0].to_numpy()[mask]  # First column (Country/State)
+        values = values[mask]
+        
+        total = len(values)
+        positions = _sample_positions(total, max_points, values)
+        if positions is not None:
+            labels, values = labels[positions], values[positions]
+        
+        return _figure(
+            [{
+                'type': 'treemap',
+                'labels': labels,
+                'values': values,
+                'parents': [""] * len(values),
+                'textinfo': "label+value",
+                'marker': {
+                    'colors': _cycled_palette(self.color_palette, len(values)),
+                    'line': {'width': 2, 'color': 'white'}
+                },
+                'hovertemplate': '<b>%{label}</b><br>' + metric + ': %{value}<extra></extra>'
+            }],
+            self._layout(_sampled_title(f'{metric} Treemap View', len(values), total))
+        )
     
     def create_line_chart(self, df: pd.DataFrame, metric: str) -> go.Figure:
         """Create a line chart for trend visualization"""
-        try:
-            if df.empty or metric not in df.columns:
-                return self._create_error_chart(f"No data available for {metric}")
-            
-            fig = go.Figure()
-            
-            # Add line for each entity
-            for i, (_, row) in enumerate(df.iterrows()):
-                fig.add_trace(go.Scatter(
-                    x=[0, 1],  # Simple x-axis for comparison
-                    y=[0, row[metric]] if pd.notna(row[metric]) else [0, 0],
-                    mode='lines+markers',
-                    name=row.iloc[0],  # First column (Country/State)
-                    line=dict(color=self.color_palette[i % len(self.color_palette)], width=3),
-                    marker=dict(size=8)
-                ))
-            
-            fig.update_layout(
-                title=f'{metric} Trends',
-                xaxis_title='Comparison Scale',
-                yaxis_title=metric,
-                **self.layout_config
-            )
-            
-            return fig
-            
-        except Exception as e:
-            return self._create_error_chart(f"Error creating line chart: {str(e)}")
+        if df.empty or metric not in df.columns:
+            return self.create_error_chart(f"No data available for {metric}")
+        
+        labels = df.iloc[:, 0].tolist()  # First column (Country/State)
+        values = df[metric].tolist()
+        colors = _cycled_palette(self.color_palette, len(labels))
+        
+        # One line per entity, built in a single pass
+        traces = [
+            {
+                'type': 'scatter',
+                'x': [0, 1],  # Simple x-axis for comparison
+                'y': [0, value] if pd.notna(value) else [0, 0],
+                'mode': 'lines+markers',
+                'name': label,
+                'line': {'color': color, 'width': 3},
+                'marker': {'size': 8}
+            }
+            for label, value, color in zip(labels, values, colors)
+        ]
+        
+        return _figure(traces, self._layout(f'{metric} Trends', 'Comparison Scale', metric))
     
-    def create_scatter_plot(self, df: pd.DataFrame, metric: str) -> go.Figure:
-        """Create a scatter plot with entity labels"""
-        try:
-            if df.empty or metric not in df.columns:
-                return self._create_error_chart(f"No data available for {metric}")
-            
-            df_clean = df.dropna(subset=[metric])
-            if df_clean.empty:
-                return self._create_error_chart("No valid data for scatter plot")
-            
-            fig = go.Figure(data=go.Scatter(
-                x=range(len(df_clean)),
-                y=df_clean[metric],
-                mode='markers+text',
-                text=df_clean.iloc[:, 0],  # First column (Country/State)
-                textposition='top center',
-                marker=dict(
-                    size=12,
-                    color=self.color_palette[:len(df_clean)],
-                    line=dict(width=2, color='white')
-                ),
-                hovertemplate='<b>%{text}</b><br>' + metric + ': %{y}<extra></extra>'
-            ))
-            
-            fig.update_layout(
-                title=f'{metric} Scatter Plot',
-                xaxis_title='Entity Index',
-                yaxis_title=metric,
-                **self.layout_config
-            )
-            
-            return fig
-            
-        except Exception as e:
-            return self._create_error_chart(f"Error creating scatter plot: {str(e)}")
+    def create_scatter_plot(self, df: pd.DataFrame, metric: str, use_gl: Optional[bool] = None,
+                            max_points: Optional[int] = MAX_POINTS) -> go.Figure:
+        """Create a scatter plot with entity labels (WebGL-rendered when use_gl is set, or by size if None).
+        Above max_points entities, a uniform sample is drawn."""
+        if df.empty or metric not in df.columns:
+            return self.create_error_chart(f"No data available for {metric}")
+        
+        values = df[metric].to_numpy(dtype=np.float64)
+        mask = ~np.isnan(values)
+        if not mask.any():
+            return self.create_error_chart("No valid data for scatter plot")
+        values = values[mask]
+        labels = df.iloc[:, 0].to_numpy()[mask]  # First column (Country/State)
+        
+        total = len(values)
+        positions = _sample_positions(total, max_points)
+        if positions is not None:
+            values, labels = values[positions], labels[positions]
+        
+        return _figure(
+            [{
+                'type': _scatter_type(len(values), use_gl),
+                'x': np.arange(len(values), dtype=np.int32),
+                'y': values,
+                'mode': 'markers+text',
+                'text': labels,
+                'textposition': 'top center',
+                'marker': {
+                    'size': 12,
+                    'color': _cycled_palette(self.color_palette, len(values)),
+                    'line': {'width': 2, 'color': 'white'}
+                },
+                'hovertemplate': '<b>%{text}</b><br>' + metric + ': %{y}<extra></extra>'
+            }],
+            self._layout(_sampled_title(f'{metric} Scatter Plot', len(values), total), 'Entity Index', metric)
+        )
     
     def create_radar_chart(self, df: pd.DataFrame, metrics: List[str]) -> go.Figure:
         """Create a radar chart for multi-metric comparison"""
-        try:
-            if df.empty or not metrics:
-                return self._create_error_chart("No data available for radar chart")
-            
-            # Filter available metrics
-            available_metrics = [m for m in metrics if m in df.columns]
-            if not available_metrics:
-                return self._create_error_chart("No valid metrics for radar chart")
-            
-            fig = go.Figure()
-            
-            for i, (_, row) in enumerate(df.iterrows()):
-                # Normalize values for radar chart (0-100 scale)
-                values = []
-                for metric in available_metrics:
-                    val = row[metric]
-                    if pd.notna(val):
-                        # Simple normalization based on max value in column
-                        max_val = df[metric].max()
-                        normalized = (val / max_val) * 100 if max_val > 0 else 0
-                        values.append(normalized)
-                    else:
-                        values.append(0)
-                
-                # Close the radar chart
-                values += values[:1]
-                metric_labels = available_metrics + available_metrics[:1]
-                
-                fig.add_trace(go.Scatterpolar(
-                    r=values,
-                    theta=metric_labels,
-                    fill='toself',
-                    name=row.iloc[0],  # First column (Country/State)
-                    line=dict(color=self.color_palette[i % len(self.color_palette)])
-                ))
-            
-            fig.update_layout(
-                polar=dict(
-                    radialaxis=dict(
-                        visible=True,
-                        range=[0, 100]
-                    )),
-                title="Multi-Metric Radar Comparison",
-                **self.layout_config
-            )
-            
-            return fig
-            
-        except Exception as e:
-            return self._create_error_chart(f"Error creating radar chart: {str(e)}")
+        if df.empty or not metrics:
+            return self.create_error_chart("No data available for radar chart")
+        
+        # Filter available metrics
+        columns = set(df.columns)
+        available_metrics = [m for m in metrics if m in columns]
+        if not available_metrics:
+            return self.create_error_chart("No valid metrics for radar chart")
+        
+        labels = df.iloc[:, 0].tolist()  # First column (Country/State)
+        
+        # Normalize values for radar chart (0-100 scale) against each column's max,
+        # in one matrix op; missing values and non-positive columns map to 0
+        matrix = df[available_metrics].to_numpy(dtype=np.float64)
+        max_vals = df[available_metrics].max().to_numpy(dtype=np.float64)
+        positive = max_vals > 0
+        normalized = np.where(positive, matrix / np.where(positive, max_vals, 1.0) * 100, 0.0)
+        np.nan_to_num(normalized, copy=False, nan=0.0)
+        
+        # Close the radar chart
+        closed = np.concatenate([normalized, normalized[:, :1]], axis=1)
+        metric_labels = available_metrics + available_metrics[:1]
+        colors = _cycled_palette(self.color_palette, len(labels))
+        
+        traces = [
+            {
+                'type': 'scatterpolar',
+                'r': r,
+                'theta': metric_labels,
+                'fill': 'toself',
+                'name': label,
+                'line': {'color': color}
+            }
+            for label, r, color in zip(labels, closed.tolist(), colors)
+        ]
+        
+        return _figure(traces, self._layout(
+            "Multi-Metric Radar Comparison",
+            polar={'radialaxis': {'visible': True, 'range': [0, 100]}}
+        ))
     
-    def _create_error_chart(self, error_message: str) -> go.Figure:
+    def create_error_chart(self, error_message: str) -> go.Figure:
         """Create a placeholder chart for errors"""
-        fig = go.Figure()
-        fig.add_annotation(
-            text=f"⚠️ {error_message}",
-            xref="paper", yref="paper",
-            x=0.5, y=0.5,
-            xanchor='center', yanchor='middle',
-            showarrow=False,
-            font=dict(size=16, color="red")
-        )
-        fig.update_layout(
-            title="Chart Error",
-            xaxis=dict(showgrid=False, showticklabels=False, zeroline=False),
-            yaxis=dict(showgrid=False, showticklabels=False, zeroline=False),
-            **self.layout_config
-        )
-        return fig
\ No newline at end of file
+        # The cached layout is only read; each call still gets its own Figure to recolor
+        return _figure([], _error_layout(error_message))
\ No newline at end of file